@@ -1,14 +1,20 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import os
 from typing import Literal
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
-from src.data_generation.utils import save_data
-from .wagon import Wagon
-from .wagon_simulator import WagonSimulator
+from src.data_generation.utils import save_data, save_data_stream, save_partitioned_parquet
+from .wagon import META_SCHEMA, Wagon, generate_wagon_metadata
+from .wagon_simulator import FAILURE_SCHEMA, WagonSimulator
 from faker import Faker
 
+# pandas/pyarrow writers release the GIL, so per-wagon files can be written concurrently
+MAX_IO_WORKERS = min(32, os.cpu_count() or 1)
+
 
 class FleetManager:
     def __init__(
@@ -26,6 +32,7 @@ class FleetManager:
         self.failure_output_dir = output_dir + "/failures"
         self.wagon_types = wagon_types
         self.n_future_days = n_future_days
+        self._future_cutoff_td = pd.Timedelta(days=n_future_days)
         self.n_operators = n_operators
 
         os.makedirs(self.output_dir, exist_ok=True)
@@ -36,48 +43,82 @@ class FleetManager:
         fake = Faker()
         self.wagon_operators = [fake.company() for _ in range(n_operators)] 
         self.wagons: list[Wagon] = []
+        self._metadata = META_SCHEMA.empty_table()
         self.simulators: list[WagonSimulator] = []
         self.failure_stats = defaultdict(list)
 
     def generate_wagons(self):
-        self.wagons = [Wagon(self.wagon_types, wagon_operators=self.wagon_operators) for _ in range(self.num_wagons)]
+        self._metadata = generate_wagon_metadata(self.num_wagons, self.wagon_types, self.wagon_operators)
+        self.wagons = [Wagon.from_data(record) for record in self._metadata.to_pylist()]
 
-    def run_simulation(self):
-        for wagon in self.wagons:
-            sim = WagonSimulator(wagon)
-            sim.simulate()
-            self.simulators.append(sim)
+    def run_simulation(self, max_workers: int | None = None, use_processes: bool = True):
+        """Simulate all wagons in parallel. Set use_processes=False to run in a thread pool instead."""
+        self.simulators.extend(
+            WagonSimulator.simulate_fleet(self.wagons, max_workers=max_workers, use_processes=use_processes)
+        )
 
     def save_historical_simulation_results(self, file_type: Literal["CSV", "NDJSON", "PARQUET"]):
-        for sim in self.simulators:
-            historic_data = sim.simulated_time_series[
-                sim.simulated_time_series['timestamp'] <= pd.Timestamp.now() - pd.Timedelta(days=self.n_future_days)
-            ]
-            save_data(
-                historic_data,
-                self.sensor_output_dir,
-                file_type=file_type,
-                file_name=f"{sim.wagon.get_id()}_sensors.{file_type}",
-            )
+        """
+        Save historic sensor data. CSV and NDJSON produce one file per wagon, PARQUET produces a single
+        dataset partitioned by wagon (<sensor_output_dir>/wagon_id=<id>/part-0.parquet).
+        """
+        cutoff = pd.Timestamp.now() - self._future_cutoff_td
+        cutoff_np = cutoff.to_datetime64()
+        historic_data = [
+            (sim, sim.simulated_time_series[sim.simulated_time_series['timestamp'].values <= cutoff_np])
+            for sim in self.simulators
+        ]
+
+        if file_type == "PARQUET":
+            # Nothing to write for an empty fleet, like the per-wagon CSV/NDJSON branches
+            if not historic_data:
+                return
+            tables = []
+            for _, data in historic_data:
+                table = pa.Table.from_pandas(data, preserve_index=False)
+                # The partition column shares the buffers of the existing per-row id column
+                tables.append(table.append_column("wagon_id", table["id"]))
+            save_partitioned_parquet(pa.concat_tables(tables), self.sensor_output_dir, partition_column="wagon_id")
+            return
+
+        tasks = [
+            (data, self.sensor_output_dir, file_type, f"{sim.wagon.id}_sensors.{file_type}")
+            for sim, data in historic_data
+        ]
+        self._save_many(tasks)
+
+    @staticmethod
+    def _save_many(tasks: list[tuple]):
+        """Write (data, path, file_type, file_name) tasks concurrently."""
+        with ThreadPoolExecutor(max_workers=MAX_IO_WORKERS) as executor:
+            # Consume the iterator so that exceptions from the workers are raised here
+            list(executor.map(lambda task: save_data(*task), tasks))
+
+    def _get_all_failures_arrow(self) -> pa.Table:
+        # One columnar build over the fleet's failure arrays, without materializing any failure records
+        return WagonSimulator.combined_failures_arrow(self.simulators)
 
     def get_all_failures(self) -> pd.DataFrame:
-        all_failures = pd.concat([sim.get_failures() for sim in self.simulators], ignore_index=True)
-        return all_failures
+        all_failures = self._get_all_failures_arrow()
+        return all_failures.to_pandas(self_destruct=True, use_threads=True)
 
     def get_future_failures(self) -> pd.DataFrame:
-        all_failures = self.get_all_failures()
-        future_failures = all_failures[
-            all_failures['timestamp'] > pd.Timestamp.now() - pd.Timedelta(days=self.n_future_days)
-        ]
-        return future_failures
+        cutoff = pd.Timestamp.now() - self._future_cutoff_td
+        cutoff_np = cutoff.to_datetime64()
+        # Filter on the Arrow table so only the matching rows are converted to pandas
+        all_failures = self._get_all_failures_arrow()
+        future_failures = all_failures.filter(pc.greater(all_failures['timestamp'], pa.scalar(cutoff_np)))
+        return future_failures.to_pandas(self_destruct=True)
 
     def save_historical_failure_results(self, file_type: Literal["CSV", "NDJSON", "PARQUET"], one_file: bool):
         """Save historical failure results. 'Historic' refers to data up to n_future_days in the past."""
+        cutoff = pd.Timestamp.now() - self._future_cutoff_td
+        cutoff_np = cutoff.to_datetime64()
         if one_file:
-            combined_failures = self.get_all_failures()
-            historic_failures = combined_failures[
-                combined_failures['timestamp'] <= pd.Timestamp.now() - pd.Timedelta(days=self.n_future_days)
-            ]
+            combined_failures = self._get_all_failures_arrow()
+            historic_failures = combined_failures.filter(
+                pc.less_equal(combined_failures['timestamp'], pa.scalar(cutoff_np))
+            )
             save_data(
                 historic_failures,
                 self.failure_output_dir,
@@ -85,45 +126,45 @@ class FleetManager:
                 file_name=f"combined_failures.{file_type}",
             )
             return
-        
+
+        tasks = []
         for sim in self.simulators:
-            all_failures = sim.get_failures()
-            historic_failures = all_failures[
-                all_failures['timestamp'] <= pd.Timestamp.now() - pd.Timedelta(days=self.n_future_days)
-            ]
-            save_data(
-                historic_failures,
-                self.failure_output_dir,
-                file_type=file_type,
-                file_name=f"{sim.wagon.get_id()}_failures.{file_type}",
+            all_failures = sim.failures_arrow
+            historic_failures = all_failures.filter(
+                pc.less_equal(all_failures['timestamp'], pa.scalar(cutoff_np))
+            )
+            tasks.append(
+                (historic_failures, self.failure_output_dir, file_type, f"{sim.wagon.id}_failures.{file_type}")
             )
+        self._save_many(tasks)
 
     def save_future_failures_results(self, file_type: Literal["CSV", "NDJSON", "PARQUET"]):
         """Save all future failures into a single file. 'Future' refers to all data after n_future_days in the past."""
-        combined_failures = pd.concat([sim.get_failures() for sim in self.simulators], ignore_index=True)
-        future_failures = combined_failures[
-            combined_failures['timestamp'] > pd.Timestamp.now() - pd.Timedelta(days=self.n_future_days)
-        ]
-        save_data(
+        cutoff = pd.Timestamp.now() - self._future_cutoff_td
+        cutoff_scalar = pa.scalar(cutoff.to_datetime64())
+        # Filter and write wagon by wagon so the fleet's failures are never combined in memory
+        future_failures = (
+            failures.filter(pc.greater(failures['timestamp'], cutoff_scalar))
+            for failures in (sim.failures_arrow for sim in self.simulators)
+        )
+        save_data_stream(
             future_failures,
+            FAILURE_SCHEMA,
             self.output_dir,
             file_type=file_type,
             file_name=f"combined_future_failures.{file_type}",
         )
 
     def save_metadata_single_files(self, file_type: Literal["CSV", "NDJSON", "PARQUET"]):
-        for wagon in self.wagons:
-            save_data(
-                wagon.data,
-                self.metadata_output_dir,
-                file_type=file_type,
-                file_name=f"{wagon.get_id()}_metadata.{file_type}",
-            )
+        tasks = [
+            (self._metadata.slice(i, 1), self.metadata_output_dir, file_type, f"{wagon_id}_metadata.{file_type}")
+            for i, wagon_id in enumerate(self._metadata["id"].to_pylist())
+        ]
+        self._save_many(tasks)
 
     def save_metadata_one_file(self, file_type: Literal["CSV", "NDJSON", "PARQUET"]):
-        combined_metadata = pd.DataFrame([wagon.data for wagon in self.wagons])
         save_data(
-            combined_metadata,
+            self._metadata,
             self.metadata_output_dir,
             file_type=file_type,
             file_name=f"combined_metadata.{file_type}",
@@ -135,17 +176,23 @@ class FleetManager:
 
     def get_historic_fleet_training_data(self) -> pd.DataFrame:
         # Combine all historic wagon results into a single DataFrame, including wagon id and failure column
-        all_training_data = self.get_fleet_training_data()
-        historic_training_data = all_training_data[
-            all_training_data['timestamp'] < pd.Timestamp.now() - pd.Timedelta(days=self.n_future_days)
-        ]
-        return historic_training_data
+        cutoff = pd.Timestamp.now() - self._future_cutoff_td
+        cutoff_np = cutoff.to_datetime64()
+        all_training_data = self._get_fleet_training_data_arrow()
+        historic_training_data = all_training_data.filter(
+            pc.less(all_training_data['timestamp'], pa.scalar(cutoff_np))
+        )
+        return historic_training_data.to_pandas(self_destruct=True, use_threads=True)
+
+    def _get_fleet_training_data_arrow(self) -> pa.Table:
+        tables = [pa.Table.from_pandas(sim.training_data, preserve_index=False) for sim in self.simulators]
+        all_results = pa.concat_tables(tables, promote_options="default")
+        failure_index = all_results.schema.get_field_index("failure")
+        return all_results.set_column(
+            failure_index, "failure", pc.cast(all_results["failure"], pa.float64())
+        )
 
     def get_fleet_training_data(self) -> pd.DataFrame:
         # Combine all wagon results into a single DataFrame, including wagon id and failure column
-
-        all_results = pd.concat(
-            [sim.get_training_data() for sim in self.simulators], ignore_index=True
-        )
-        all_results["failure"] = all_results["failure"].astype(float)
-        return all_results
+        all_results = self._get_fleet_training_data_arrow()
+        return all_results.to_pandas(self_destruct=True, use_threads=True)
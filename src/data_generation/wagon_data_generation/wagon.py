@@ -1,53 +1,97 @@
 import os
-import random
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Literal
 from faker import Faker
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet
 
+# Faker construction loads all providers, so one instance is shared by every wagon
+_FAKE = Faker()
 
+
+# Metadata column names (as written to files) mapped to Wagon attributes
+METADATA_COLUMNS = {
+    "id": "id",
+    "Type": "type",
+    "Capacity_tons": "capacity_tons",
+    "Length_m": "length_m",
+    "Width_m": "width_m",
+    "Height_m": "height_m",
+    "Operator": "operator",
+    "Owner": "owner",
+    "Manufacture_Date": "manufacture_date",
+    "Sensor_Installation_Date": "sensor_installation_date",
+}
+
+# Explicit column types of the fleet metadata table, so no types are inferred when it is built
+META_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("Type", pa.string()),
+        ("Capacity_tons", pa.int32()),
+        ("Length_m", pa.float64()),
+        ("Width_m", pa.float64()),
+        ("Height_m", pa.float64()),
+        ("Operator", pa.string()),
+        ("Owner", pa.string()),
+        ("Manufacture_Date", pa.string()),
+        ("Sensor_Installation_Date", pa.string()),
+    ]
+)
+
+
+@dataclass(slots=True)
 class Wagon:
-    def __init__(self, wagon_types: list, wagon_operators: list):
-        """
-        Initializes a new Wagon instance. Wagons are at least 5 years old and have sensor data for maximum 5 years and minimum 1 year.
+    """Static wagon metadata. Dates are stored as 'YYYY-MM-DD' strings."""
+
+    id: str
+    type: str
+    capacity_tons: int
+    length_m: float
+    width_m: float
+    height_m: float
+    operator: str
+    owner: str
+    manufacture_date: str
+    sensor_installation_date: str
 
+    @classmethod
+    def generate(cls, wagon_types: list, wagon_operators: list) -> "Wagon":
+        """
+        Generates a random wagon. Wagons are at least 5 years old and have sensor data for maximum 5 years and minimum 1 year.
         """
-        fake = Faker()
-
-        manufacture_date = fake.date_between(start_date="-30y", end_date="-5y")
-        self.data = {
-            "id": f"WGN-{fake.unique.random_int(10000, 99999)}",
-            "Type": random.choice(wagon_types),
-            "Capacity_tons": random.randint(20, 120),
-            "Length_m": round(random.uniform(8.0, 25.0), 2),
-            "Width_m": round(random.uniform(2.5, 3.5), 2),
-            "Height_m": round(random.uniform(2.0, 4.5), 2),
-            "Operator": wagon_operators[random.randint(0, len(wagon_operators)-1)],
-            "Owner": fake.company(),
-            "Manufacture_Date": manufacture_date.strftime("%Y-%m-%d"),
-            "Sensor_Installation_Date": fake.date_between(
-                start_date="-5y", end_date="-1y"
-            ).strftime("%Y-%m-%d"),
-        }
+        return cls.from_data(generate_wagon_metadata(1, wagon_types, wagon_operators).to_pylist()[0])
+
+    @classmethod
+    def from_data(cls, data: dict) -> "Wagon":
+        """Create a wagon from a metadata record, e.g. a row of generate_wagon_metadata()."""
+        return cls(**{attribute: data[column] for column, attribute in METADATA_COLUMNS.items()})
+
+    @property
+    def data(self) -> dict:
+        """Metadata record keyed by the file column names."""
+        return {column: getattr(self, attribute) for column, attribute in METADATA_COLUMNS.items()}
 
     def get_id(self):
-        return self.data["id"]
+        return self.id
 
     def get_type(self):
-        return self.data["Type"]
+        return self.type
 
     def get_age_years(self):
         return (
             datetime.now().year
-            - datetime.strptime(self.data["Manufacture_Date"], "%Y-%m-%d").year
+            - datetime.strptime(self.manufacture_date, "%Y-%m-%d").year
         )
 
     def get_sensor_installation_date(self):
-        return self.data["Sensor_Installation_Date"]
+        return self.sensor_installation_date
 
     def write_wagon_metadata(
         self, path: str, file_type: Literal["csv", "json", "parquet"], file_name: str
@@ -64,7 +108,7 @@ class Wagon:
 
     def generate_info_pdf(self, output_dir: str):
         """Generates static wagon info PDF."""
-        pdf_path = os.path.join(output_dir, f"{self.get_id()}.pdf")
+        pdf_path = os.path.join(output_dir, f"{self.id}.pdf")
         doc = SimpleDocTemplate(pdf_path, pagesize=A4)
         styles = getSampleStyleSheet()
         elements = []
@@ -97,3 +141,36 @@ class Wagon:
         )
         elements.append(footer)
         doc.build(elements)
+
+
+def _random_dates(rng: np.random.Generator, n: int, years_ago_start: int, years_ago_end: int) -> np.ndarray:
+    """Draw n dates uniformly between years_ago_start and years_ago_end years before today, as 'YYYY-MM-DD'."""
+    today = pd.Timestamp.today().normalize()
+    start = today - pd.DateOffset(years=years_ago_start)
+    end = today - pd.DateOffset(years=years_ago_end)
+    offsets = rng.integers(0, (end - start).days + 1, n)
+    return (start + pd.to_timedelta(offsets, unit="D")).strftime("%Y-%m-%d").to_numpy()
+
+
+def generate_wagon_metadata(num_wagons: int, wagon_types: list, wagon_operators: list) -> pa.Table:
+    """
+    Generate the metadata of a whole fleet in one batch. Wagons are at least 5 years old and have sensor data for
+    maximum 5 years and minimum 1 year. Wagon numbers are unique within the fleet. The table follows META_SCHEMA.
+    """
+    rng = np.random.default_rng()
+    wagon_numbers = rng.choice(np.arange(10000, 100000), size=num_wagons, replace=False)
+    return pa.Table.from_pydict(
+        {
+            "id": np.char.add("WGN-", wagon_numbers.astype(str)),
+            "Type": rng.choice(wagon_types, size=num_wagons),
+            "Capacity_tons": rng.integers(20, 121, num_wagons),
+            "Length_m": rng.uniform(8.0, 25.0, num_wagons).round(2),
+            "Width_m": rng.uniform(2.5, 3.5, num_wagons).round(2),
+            "Height_m": rng.uniform(2.0, 4.5, num_wagons).round(2),
+            "Operator": rng.choice(wagon_operators, size=num_wagons),
+            "Owner": [_FAKE.company() for _ in range(num_wagons)],
+            "Manufacture_Date": _random_dates(rng, num_wagons, 30, 5),
+            "Sensor_Installation_Date": _random_dates(rng, num_wagons, 5, 1),
+        },
+        schema=META_SCHEMA,
+    )
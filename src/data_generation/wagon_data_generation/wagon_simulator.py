@@ -1,49 +1,174 @@
+from copy import copy
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
-import random
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import cached_property, partial
 
 import pandas as pd
+import pyarrow as pa
 from typing import Literal
+from src.data_generation.utils import with_ns_units
 from .wagon import Wagon
 import numpy as np
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import PageBreak, SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet
 
+# Fixed schema for failure tables so per-wagon tables concatenate without type inference or promotion
+FAILURE_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("us")),
+        ("repair_time", pa.timestamp("us")),
+        ("downtime", pa.duration("us")),
+        ("cause", pa.string()),
+        ("id", pa.string()),
+    ]
+)
+
+SENSOR_COLUMNS = ["speed", "brake", "temp", "vibration", "battery"]
+
+# Parts with Weibull-like failure dynamics; failures refer to parts by their position in this dict
+PARTS = {
+    "brakes": {"lambda0": 0.002, "lifetime": 200, "beta": 2.0},
+    "axle": {"lambda0": 0.0006, "lifetime": 1200, "beta": 1.8},
+    "battery": {"lambda0": 0.0009, "lifetime": 300, "beta": 2.2},
+    "cooling": {"lambda0": 0.0004, "lifetime": 400, "beta": 2.5},
+}
+# Failure cause per part index, e.g. "brakes failure"
+FAILURE_CAUSES = np.array([f"{part} failure" for part in PARTS], dtype=object)
+_FAILURE_CAUSES_ARROW = pa.array(FAILURE_CAUSES, type=pa.string())
+
+
+def _part_failure_days(draws: np.ndarray, p_fail: np.ndarray, last_replacement_idx: int) -> np.ndarray:
+    """
+    Day indices on which a part fails, given a uniform draw per day and its failure probability per age in days.
+    A part failing on day i is replaced at the end of day i + 1 and can fail again from day i + 2.
+    """
+    n = len(draws)
+    failure_days = []
+    start = 0
+    # Only iterate over failure events: find the first day whose draw falls below the hazard.
+    # Part age is day - last_replacement_idx, so the hazards of days start..n-1 are one contiguous slice.
+    while start < n:
+        hits = draws[start:] < p_fail[start - last_replacement_idx : n - last_replacement_idx]
+        if not hits.any():
+            break
+        failure_day = start + int(np.argmax(hits))
+        failure_days.append(failure_day)
+        last_replacement_idx = failure_day + 1
+        start = failure_day + 2
+    return np.array(failure_days, dtype=np.intp)
+
+
+def _failure_table(timestamps: np.ndarray, repair_hours: np.ndarray, parts: np.ndarray, ids: pa.Array) -> pa.Table:
+    """Build a FAILURE_SCHEMA table from failure timestamps (datetime64[us]), repair hours and part indices."""
+    downtime = (repair_hours * 3_600_000_000).astype("timedelta64[us]")
+    return pa.Table.from_arrays(
+        [
+            pa.array(timestamps),
+            pa.array(timestamps + downtime),
+            pa.array(downtime),
+            _FAILURE_CAUSES_ARROW.take(pa.array(parts)),
+            ids,
+        ],
+        schema=FAILURE_SCHEMA,
+    )
+
+
+def _run_one(simulator_cls: type["WagonSimulator"], end: datetime, wagon: Wagon) -> "WagonSimulator":
+    sim = simulator_cls(wagon)
+    sim.simulate(end)
+    return sim
+
 
 class WagonSimulator:
     """
     Simulate sensor data and failures for a wagon over time with one measurement per day.
     """
 
+    # Report styles are immutable once built, so they are created once and shared by every report
+    _STYLES = getSampleStyleSheet()
+    _SUMMARY_TABLE_STYLE = TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightblue),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ]
+    )
+    _DETAIL_TABLE_STYLE = TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
+            ("BACKGROUND", (0, 1), (-1, -1), colors.whitesmoke),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ]
+    )
+    _TITLE_TEMPLATE = "<b>Failure & Repair Report — Wagon {}</b>"
+    # Static paragraphs are parsed once; reports add shallow copies so each keeps its own layout state
+    _NO_FAILURES_PARAGRAPH = Paragraph("No failures recorded.", _STYLES["Normal"])
+    _SUMMARY_HEADING = Paragraph("<b>Summary of Failures by Component</b>", _STYLES["Heading2"])
+    _DETAIL_HEADING = Paragraph("<b>Detailed Failure Log</b>", _STYLES["Heading2"])
+
     def __init__(self, wagon: Wagon):
         self.wagon = wagon
-        self.timestamps = []
-        self.failure_log = []
-
-    def simulate(self):
+        self.timestamps = pd.DatetimeIndex([], dtype="datetime64[us]")
+        # Failure log as parallel arrays in time order: day index (into timestamps), part index (into PARTS)
+        # and repair duration in hours
+        self.failure_days = np.empty(0, dtype=np.intp)
+        self.failure_parts = np.empty(0, dtype=np.int8)
+        self.repair_hours = np.empty(0, dtype=np.int64)
+        self.rng = np.random.default_rng()
+
+    @classmethod
+    def simulate_fleet(
+        cls, wagons: list[Wagon], max_workers: int | None = None, use_processes: bool = True
+    ) -> list["WagonSimulator"]:
+        """
+        Simulate many wagons in parallel and return their simulators in the order of wagons.
+        Set use_processes=False to run in a thread pool instead.
+        """
+        n_workers = max_workers or os.cpu_count() or 1
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=n_workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=n_workers)
+        # Every simulator seeds its own Generator from OS entropy when it is created in the worker,
+        # so forked workers don't share random streams
+        chunksize = max(1, len(wagons) // (4 * n_workers))
+        # Read the clock once so that all wagons are simulated up to the same day
+        end = datetime.now()
+        with executor:
+            simulators = list(executor.map(partial(_run_one, cls, end), wagons, chunksize=chunksize))
+        for wagon, sim in zip(wagons, simulators):
+            # Results come back pickled; point them at the caller's own wagon objects
+            sim.wagon = wagon
+        return simulators
+
+    def simulate(self, end: datetime | None = None):
+        """Simulate one measurement per day from the sensor installation date until end (default: now)."""
+        # Drop results cached from a previous run
+        for name in ("failure_log", "failures", "failures_arrow", "training_data"):
+            self.__dict__.pop(name, None)
         self.timestamps = pd.date_range(
-            start=self.wagon.get_sensor_installation_date(),
-            end=datetime.now(),
+            start=self.wagon.sensor_installation_date,
+            end=end or datetime.now(),
             freq="D",
-        ).tolist()
-
-        # Parts with Weibull-like failure dynamics
-        parts = {
-            "brakes": {"lambda0": 0.002, "lifetime": 200, "beta": 2.0},
-            "axle": {"lambda0": 0.0006, "lifetime": 1200, "beta": 1.8},
-            "battery": {"lambda0": 0.0009, "lifetime": 300, "beta": 2.2},
-            "cooling": {"lambda0": 0.0004, "lifetime": 400, "beta": 2.5},
-        }
+            unit="us",
+        )
 
-        # Assign initial states per part
-        for part in parts:
-            parts[part]["failed"] = False
-            parts[part]["last_replacement"] = self.timestamps[0] - timedelta(
-                days=random.randint(1, 365)
-            )
-            parts[part]["failures"] = []
+        n = len(self.timestamps)
+        days = np.arange(n)
+        rng = self.rng
+
+        # Assign initial states per part (day index of the last replacement, before the first timestamp)
+        initial_replacement_idx = -rng.integers(1, 366, len(PARTS))
 
         # Sensor baselines (healthy wagon)
         BASELINES = {
@@ -63,211 +188,237 @@ class WagonSimulator:
             "battery": -0.05,  # battery loses charge capacity faster
         }
 
-        # Initialize sensor series
-        speed, brake, temp, vibration, battery = [], [], [], [], []
-        failure_state = False
-
-        for t in self.timestamps:
-            wagon_failure_probs = []
-            for part, cfg in parts.items():
-                if not cfg["failed"]:
-                    part_age_days = (t - cfg["last_replacement"]).days
-                    lam = cfg["lambda0"] * (
-                        (1 + part_age_days / cfg["lifetime"]) ** cfg["beta"]
-                    )
-                    p_fail = min(1.0, lam)
-                    failure_happens = np.random.rand() < p_fail
-
-                    if failure_happens:
-                        cfg["failed"] = True
-                        repair_delay = timedelta(hours=random.randint(3, 24))
-                        repair_time = t + repair_delay
-                        cause = f"{part} failure"
-                        cfg["failures"].append(
-                            {
-                                "timestamp": t,
-                                "repair_time": repair_time,
-                                "downtime": repair_delay,
-                                "cause": cause,
-                            }
-                        )
-                        self.failure_log.append(cfg["failures"][-1])
-
-                wagon_failure_probs.append(cfg["failed"])
-
-            failure_state = any(wagon_failure_probs)
-
-            # Sensor readings — worsen over time, reset after repair
-            # Add Gaussian noise for realism
-            # Speed is mostly tied to axle & brakes; others tied to relevant parts
-            axle_age = (t - parts["axle"]["last_replacement"]).days
-            brake_age = (t - parts["brakes"]["last_replacement"]).days
-            battery_age = (t - parts["battery"]["last_replacement"]).days
-            cooling_age = (t - parts["cooling"]["last_replacement"]).days
-
-            if failure_state:
-                # Severe degradation during failure
-                speed.append(0)
-                brake.append(BASELINES["brake"] + 3 + np.random.normal(0, 0.5))
-                temp.append(BASELINES["temp"] + 40 + np.random.normal(0, 5))
-                vibration.append(BASELINES["vibration"] + 8 + np.random.normal(0, 2))
-                battery.append(
-                    max(0, (battery[-1] - np.random.uniform(0.5, 1))) if battery else 95
-                )
-            else:
-                speed.append(
-                    BASELINES["speed"]
-                    + DEGRADATION_RATES["speed"] * axle_age
-                    + np.random.normal(0, 0.5)
-                )
-                brake.append(
-                    BASELINES["brake"]
-                    + DEGRADATION_RATES["brake"] * brake_age
-                    + np.random.normal(0, 0.1)
-                )
-                temp.append(
-                    BASELINES["temp"]
-                    + DEGRADATION_RATES["temp"] * cooling_age
-                    + np.random.normal(0, 0.5)
-                )
-                vibration.append(
-                    BASELINES["vibration"]
-                    + DEGRADATION_RATES["vibration"] * axle_age
-                    + np.random.normal(0, 0.2)
-                )
-                battery.append(
-                    BASELINES["battery"]
-                    + DEGRADATION_RATES["battery"] * battery_age
-                    + np.random.normal(0, 0.5)
-                )
-
-            # After repair, reset part's baseline
-            for part, cfg in parts.items():
-                if cfg["failed"] and t >= cfg["failures"][-1]["repair_time"]:
-                    cfg["failed"] = False
-                    cfg["last_replacement"] = t
-
-        # Save results
-        self.simulated_time_series = pd.DataFrame(
-            {
-                "timestamp": self.timestamps,
-                "speed": speed,
-                "brake": brake,
-                "temp": temp,
-                "vibration": vibration,
-                "battery": battery,
-            }
+        # Readings of failed wagons: offset from the baseline and noise (standard deviation)
+        FAILURE_EFFECTS = {
+            "brake": (3, 0.5),  # braking pressure spikes
+            "temp": (40, 5),  # overheating
+            "vibration": (8, 2),  # heavy vibrations
+        }
+
+        # A part that fails on day i stays failed on days i and i + 1 (repairs take 3-24 hours and are
+        # checked at the end of each day), is replaced at the end of day i + 1 and can fail again from day i + 2.
+        # Repairs are therefore scheduled by day index when the failure is found; no per-day repair check is needed.
+        failure_state = np.zeros(n, dtype=bool)
+        part_age = {}
+        events = []
+        for part_index, (part, cfg) in enumerate(PARTS.items()):
+            # Failure probability per part age in days; ages never exceed n + 365
+            ages = np.arange(n + 366)
+            p_fail = np.minimum(1.0, cfg["lambda0"] * (1 + ages / cfg["lifetime"]) ** cfg["beta"])
+            draws = rng.random(n)
+
+            failure_days = _part_failure_days(draws, p_fail, int(initial_replacement_idx[part_index]))
+            events.extend((failure_day, part_index) for failure_day in failure_days.tolist())
+            replacement_days = failure_days + 1
+            replacement_days = replacement_days[replacement_days < n]
+            failure_state[failure_days] = True
+            failure_state[replacement_days] = True
+
+            # Day index of the part's last replacement as of each day
+            last_replacements = np.full(n, initial_replacement_idx[part_index])
+            last_replacements[replacement_days] = replacement_days
+            part_age[part] = days - np.maximum.accumulate(last_replacements)
+
+        # Log failures in time order, as they would occur day by day
+        events.sort()
+        self.failure_days = np.array([event[0] for event in events], dtype=np.intp)
+        self.failure_parts = np.array([event[1] for event in events], dtype=np.int8)
+        self.repair_hours = rng.integers(3, 25, len(events))
+
+        # Sensor readings — worsen over time, reset after repair
+        # Add Gaussian noise for realism
+        # Speed is mostly tied to axle & brakes; others tied to relevant parts
+        # All sensors share one preallocated float32 block, filled in place (one row per sensor)
+        readings = np.empty((len(SENSOR_COLUMNS), n), dtype=np.float32)
+        speed, brake, temp, vibration, battery = readings
+        for values, sensor, part, noise_std in (
+            (speed, "speed", "axle", 0.5),
+            (brake, "brake", "brakes", 0.1),
+            (temp, "temp", "cooling", 0.5),
+            (vibration, "vibration", "axle", 0.2),
+            (battery, "battery", "battery", 0.5),
+        ):
+            rng.standard_normal(dtype=np.float32, out=values)
+            values *= noise_std
+            values += BASELINES[sensor] + DEGRADATION_RATES[sensor] * part_age[part]
+
+        # Severe degradation during failure: only the failed days are drawn and overwritten, selected once by index
+        failed_days = np.flatnonzero(failure_state)
+        n_failed = len(failed_days)
+        speed[failed_days] = 0
+        for values, sensor in ((brake, "brake"), (temp, "temp"), (vibration, "vibration")):
+            offset, noise_std = FAILURE_EFFECTS[sensor]
+            values[failed_days] = BASELINES[sensor] + offset + rng.normal(0, noise_std, n_failed)
+        # The battery drains from the previous day's level while the wagon is failed, i.e. each run of
+        # consecutive failed days starts from the last healthy reading and subtracts the cumulative drain.
+        # Drains are positive, so clipping at 0 once equals clipping after every step.
+        battery_drain = rng.uniform(0.5, 1, n_failed)
+        if n_failed:
+            is_run_start = np.diff(failed_days, prepend=-2) > 1
+            run_starts = np.flatnonzero(is_run_start)
+            run_index = np.cumsum(is_run_start) - 1
+            start_level = battery[failed_days[run_starts] - 1].astype(np.float64)
+            if failed_days[0] == 0:
+                # A wagon that is failed on its first day starts at 95 %
+                start_level[0] = 95
+                battery_drain[0] = 0
+            total_drain = np.cumsum(battery_drain)
+            drain_before_run = total_drain[run_starts] - battery_drain[run_starts]
+            run_drain = total_drain - drain_before_run[run_index]
+            battery[failed_days] = np.maximum(0, start_level[run_index] - run_drain)
+
+        # Save results; the transposed block becomes the frame's float32 block without a copy
+        self.simulated_time_series = pd.DataFrame(readings.T, columns=SENSOR_COLUMNS, copy=False)
+        self.simulated_time_series.insert(0, "timestamp", self.timestamps)
+        # Arrow-backed id column: one string buffer instead of n Python object references, converted to Arrow zero-copy
+        self.simulated_time_series["id"] = pd.arrays.ArrowExtensionArray(pa.repeat(pa.scalar(self.wagon.id), n))
+
+    @property
+    def failure_timestamps(self) -> np.ndarray:
+        """Timestamps (datetime64[us]) of the logged failures."""
+        return self.timestamps.to_numpy()[self.failure_days]
+
+    @cached_property
+    def failures(self) -> pd.DataFrame:
+        """Failure log as a DataFrame, built once per simulation."""
+        # Converted from the Arrow table so the dtypes do not depend on whether the wagon had any failures
+        return self.failures_arrow.to_pandas()
+
+    @cached_property
+    def failure_log(self) -> list[dict]:
+        """Failure events as dicts with the FAILURE_SCHEMA fields, materialized once per simulation."""
+        return self.failures.to_dict("records")
+
+    @cached_property
+    def failures_arrow(self) -> pa.Table:
+        """Failures as a pyarrow Table with FAILURE_SCHEMA, built once per simulation."""
+        return _failure_table(
+            self.failure_timestamps,
+            self.repair_hours,
+            self.failure_parts,
+            pa.repeat(pa.scalar(self.wagon.id), len(self.failure_days)),
+        )
+
+    @classmethod
+    def combined_failures_arrow(cls, simulators: list["WagonSimulator"]) -> pa.Table:
+        """Failures of many simulators as one FAILURE_SCHEMA table, built in one pass over their failure arrays."""
+        return _failure_table(
+            np.concatenate([np.empty(0, "datetime64[us]")] + [sim.failure_timestamps for sim in simulators]),
+            np.concatenate([np.empty(0, np.int64)] + [sim.repair_hours for sim in simulators]),
+            np.concatenate([np.empty(0, np.int8)] + [sim.failure_parts for sim in simulators]),
+            pa.array(
+                np.repeat(
+                    np.array([sim.wagon.id for sim in simulators], dtype=object),
+                    [len(sim.failure_days) for sim in simulators],
+                ),
+                type=pa.string(),
+            ),
         )
-        self.simulated_time_series["id"] = self.wagon.get_id()
 
     def get_failures(self) -> pd.DataFrame:
-        if not self.failure_log:
-            dtypes = {
-                "id": "string",
-                "timestamp": "datetime64[ns]",
-                "repair_time": "datetime64[ns]",
-                "downtime": "timedelta64[ns]",
-                "cause": "object",
-            }
-            empty_df = pd.DataFrame({col: pd.Series(dtype=dt) for col, dt in dtypes.items()})
-            return empty_df
-        failures = pd.DataFrame(self.failure_log)
-        failures["id"] = self.wagon.get_id()
-        return failures
+        return self.failures
 
     def get_results(self) -> pd.DataFrame:
-        return pd.DataFrame(self.simulated_time_series)
+        """Simulated sensor data. This is the simulator's own frame, not a copy."""
+        return self.simulated_time_series
 
-    def get_training_data(self) -> pd.DataFrame:
-        """Return training data with failure labels for the wagon."""
+    @cached_property
+    def training_data(self) -> pd.DataFrame:
+        """Training data with failure labels for the wagon, built once per simulation."""
         results = self.get_results()
-        failures = self.get_failures()
-        results["failure"] = False
-        results.loc[
-            results["timestamp"].isin(failures["timestamp"]), "failure"
-        ] = True
-        return results
-
-    def generate_failure_pdf(self):
+        # Failures fall on simulated days, so label them by day index instead of matching timestamps
+        labels = np.zeros(len(results), dtype=bool)
+        labels[self.failure_days] = True
+        # assign returns a new frame, so the simulated sensor data itself stays unlabeled
+        return results.assign(failure=labels)
+
+    def get_training_data(self) -> pd.DataFrame:
+        return self.training_data
+
+    def write_sensor_data(self, path: str, file_type: Literal["csv", "json", "parquet"]):
+        """Writes the simulated sensor data to the given file path in the specified file format."""
+        if file_type == "csv":
+            # Single vectorized write of the existing frame; sensor readings don't need full float precision
+            self.simulated_time_series.to_csv(path, index=False, float_format="%.4f")
+        elif file_type == "json":
+            # The timestamps are datetime64[us], which pandas < 3 mis-scales in to_json
+            with_ns_units(self.simulated_time_series).to_json(path, orient="records", date_format="iso")
+        elif file_type == "parquet":
+            self.simulated_time_series.to_parquet(path, index=False)
+
+    def generate_failure_pdf(self, output_dir: str):
         # Set PDF path per wagon
-        pdf_path = os.path.join(self.output_dir, f"{self.wagon.get_id()}_failures.pdf")
+        pdf_path = os.path.join(output_dir, f"{self.wagon.id}_failures.pdf")
         doc = SimpleDocTemplate(pdf_path, pagesize=A4)
-        styles = getSampleStyleSheet()
+        elements = self._failure_report_elements()
+        # Reports without failures only state that
+        if len(self.failure_days):
+            elements.append(self._report_footer())
+        doc.build(elements)
+
+    @classmethod
+    def build_fleet_report(cls, simulators: list["WagonSimulator"], path: str):
+        """Writes the failure reports of many wagons into one PDF, one wagon per page, built in one pass."""
+        doc = SimpleDocTemplate(path, pagesize=A4)
         elements = []
+        for sim in simulators:
+            elements.extend(sim._failure_report_elements())
+            elements.append(PageBreak())
+        # The footer goes on the last wagon's page
+        if elements:
+            elements[-1] = cls._report_footer()
+        doc.build(elements)
 
-        # PDF Title
-        title = Paragraph(
-            f"<b>Failure & Repair Report — Wagon {self.wagon.get_id()}</b>",
-            styles["Title"],
+    @classmethod
+    def _report_footer(cls) -> Paragraph:
+        return Paragraph(
+            f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            cls._STYLES["Normal"],
         )
+
+    def _failure_report_elements(self) -> list:
+        """Flowables of the wagon's failure report (title, summary and detail tables), without the footer."""
+        styles = self._STYLES
+        elements = []
+
+        # PDF Title
+        title = Paragraph(self._TITLE_TEMPLATE.format(self.wagon.id), styles["Title"])
         elements.append(title)
         elements.append(Spacer(1, 16))
 
         # If no failures recorded, just report that
-        if not self.failure_log:
-            elements.append(Paragraph("No failures recorded.", styles["Normal"]))
-            doc.build(elements)
-            return
+        if not len(self.failure_days):
+            elements.append(copy(self._NO_FAILURES_PARAGRAPH))
+            return elements
+
+        part_names = [part.capitalize() for part in PARTS]
 
         # ================================
         # 1. Summarize failures per part
         # ================================
-        failures_by_part = {}
-        for failure in self.failure_log:
-            part = failure["cause"].split()[0]  # e.g., "brakes failure" -> "brakes"
-            if part not in failures_by_part:
-                failures_by_part[part] = []
-            failures_by_part[part].append(failure)
-
-        # Compute summary table
+        # Parts in the order of their first failure; failure_days is sorted, so each part's days are too
+        _, first_failure = np.unique(self.failure_parts, return_index=True)
         summary_data = [["Part", "Total Failures", "Total Downtime (h)", "MTBF (days)"]]
-        for part, failures in failures_by_part.items():
-            # Sort failures by timestamp
-            sorted_failures = sorted(failures, key=lambda x: x["failure_timestamp"])
-
-            # Calculate MTBF (Mean Time Between Failures)
-            if len(sorted_failures) > 1:
-                deltas = [
-                    (
-                        sorted_failures[i]["failure_timestamp"]
-                        - sorted_failures[i - 1]["failure_timestamp"]
-                    ).days
-                    for i in range(1, len(sorted_failures))
-                ]
-                mtbf = np.mean(deltas)
-            else:
-                mtbf = float("nan")
-
-            total_downtime = sum(
-                [f["downtime"].total_seconds() / 3600 for f in failures]
-            )
+        for part_index in self.failure_parts[np.sort(first_failure)].tolist():
+            is_part = self.failure_parts == part_index
+            failure_days = self.failure_days[is_part]
+            # Calculate MTBF (Mean Time Between Failures) from the gaps between the failure days
+            mtbf = np.diff(failure_days).mean() if len(failure_days) > 1 else float("nan")
+            total_downtime = self.repair_hours[is_part].sum()
 
             summary_data.append(
                 [
-                    part.capitalize(),
-                    str(len(failures)),
+                    part_names[part_index],
+                    str(len(failure_days)),
                     f"{total_downtime:.1f}",
                     f"{mtbf:.1f}" if not np.isnan(mtbf) else "N/A",
                 ]
             )
 
         summary_table = Table(summary_data, colWidths=[100, 100, 140, 140])
-        summary_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightblue),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ]
-            )
-        )
+        summary_table.setStyle(self._SUMMARY_TABLE_STYLE)
 
-        elements.append(
-            Paragraph("<b>Summary of Failures by Component</b>", styles["Heading2"])
-        )
+        elements.append(copy(self._SUMMARY_HEADING))
         elements.append(summary_table)
         elements.append(Spacer(1, 20))
 
@@ -284,45 +435,23 @@ class WagonSimulator:
                 "Cause",
             ]
         ]
-        for i, failure in enumerate(self.failure_log, 1):
-            data.append(
-                [
-                    str(i),
-                    failure["cause"].split()[0].capitalize(),
-                    failure["failure_timestamp"].strftime("%Y-%m-%d %H:%M"),
-                    failure["repair_time"].strftime("%Y-%m-%d %H:%M"),
-                    f"{failure['downtime'].total_seconds() / 3600:.1f}",
-                    failure["cause"],
-                ]
-            )
+        # Format each column once from the failure arrays instead of per failure record
+        failure_times = self.timestamps[self.failure_days]
+        repair_times = failure_times + pd.to_timedelta(self.repair_hours, unit="h")
+        rows = zip(
+            self.failure_parts.tolist(),
+            failure_times.strftime("%Y-%m-%d %H:%M"),
+            repair_times.strftime("%Y-%m-%d %H:%M"),
+            self.repair_hours.tolist(),
+            FAILURE_CAUSES[self.failure_parts],
+        )
+        for i, (part_index, failure_time, repair_time, downtime_h, cause) in enumerate(rows, 1):
+            data.append([str(i), part_names[part_index], failure_time, repair_time, f"{downtime_h:.1f}", cause])
 
         detail_table = Table(data, colWidths=[60, 80, 120, 120, 80, 160])
-        detail_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.whitesmoke),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ]
-            )
-        )
+        detail_table.setStyle(self._DETAIL_TABLE_STYLE)
 
-        elements.append(Paragraph("<b>Detailed Failure Log</b>", styles["Heading2"]))
+        elements.append(copy(self._DETAIL_HEADING))
         elements.append(detail_table)
         elements.append(Spacer(1, 20))
-
-        # ================================
-        # 3. Footer
-        # ================================
-        footer = Paragraph(
-            f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            styles["Normal"],
-        )
-        elements.append(footer)
-
-        # Build PDF
-        doc.build(elements)
+        return elements
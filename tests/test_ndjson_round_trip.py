@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.data_generation.utils import save_data, save_data_stream
+from src.data_generation.wagon_data_generation.wagon import Wagon
+from src.data_generation.wagon_data_generation.wagon_simulator import FAILURE_SCHEMA, WagonSimulator
+
+
+def _failures() -> pa.Table:
+    """Two failures with microsecond units, as built by the simulator."""
+    timestamp = np.array(["2024-06-25T00:00", "2025-12-03T00:00"], dtype="datetime64[us]")
+    downtime = np.array([9, 1], dtype="timedelta64[h]").astype("timedelta64[us]")
+    return pa.table(
+        {
+            "timestamp": timestamp,
+            "repair_time": timestamp + downtime,
+            "downtime": downtime,
+            "cause": ["brakes failure", "axle failure"],
+            "id": ["WGN-10000", "WGN-10000"],
+        },
+        schema=FAILURE_SCHEMA,
+    )
+
+
+class NDJSONRoundTripTest(unittest.TestCase):
+    """NDJSON files must keep the timestamp and duration values, also on pandas < 3 with non-ns units."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def assert_failures_equal(self, file_name: str):
+        expected = _failures().to_pandas()
+        actual = pd.read_json(os.path.join(self.tmp.name, file_name), lines=True, convert_dates=False)
+        for column in ("timestamp", "repair_time"):
+            self.assertTrue((pd.to_datetime(actual[column]).to_numpy() == expected[column].to_numpy()).all())
+        self.assertTrue((pd.to_timedelta(actual["downtime"]).to_numpy() == expected["downtime"].to_numpy()).all())
+
+    def test_save_data_arrow(self):
+        save_data(_failures(), self.tmp.name, file_type="NDJSON", file_name="failures.NDJSON")
+        self.assert_failures_equal("failures.NDJSON")
+
+    def test_save_data_pandas(self):
+        save_data(_failures().to_pandas(), self.tmp.name, file_type="NDJSON", file_name="failures.NDJSON")
+        self.assert_failures_equal("failures.NDJSON")
+
+    def test_save_data_stream(self):
+        failures = _failures()
+        save_data_stream(
+            [failures.slice(0, 1), failures.slice(1)],
+            FAILURE_SCHEMA,
+            self.tmp.name,
+            file_type="NDJSON",
+            file_name="failures.NDJSON",
+        )
+        self.assert_failures_equal("failures.NDJSON")
+
+    def test_write_sensor_data(self):
+        simulator = WagonSimulator(Wagon.generate(["Flat"], ["Operator"]))
+        simulator.simulate()
+        path = os.path.join(self.tmp.name, "sensors.json")
+        simulator.write_sensor_data(path, "json")
+        actual = pd.read_json(path, convert_dates=False)
+        expected = simulator.simulated_time_series["timestamp"].to_numpy()
+        self.assertTrue((pd.to_datetime(actual["timestamp"]).to_numpy() == expected).all())
+
+
+if __name__ == "__main__":
+    unittest.main()